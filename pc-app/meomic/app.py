@@ -4,14 +4,14 @@ Meo Mic - Phone to PC Microphone
 Main application that coordinates all components.
 """
 
+import logging
 import signal
 import sys
 import threading
-import time
-from typing import Optional
 
 from .audio_receiver import UdpAudioReceiver
-from .audio_output import AudioOutput
+from .audio_output import AudioOutput, mark_devices_changed
+from .device_watcher import DeviceWatcher
 from .service_broadcaster import ServiceBroadcaster
 from .main_window import MainWindow
 from .setup_wizard import SetupWizard
@@ -25,9 +25,9 @@ class MeoMicApp:
         self.audio_output = AudioOutput()
         self.broadcaster = ServiceBroadcaster(port=self.PORT)
         self.window = MainWindow()
+        self.device_watcher = DeviceWatcher()
 
         self.running = False
-        self._level_thread: Optional[threading.Thread] = None
         self._setup_shown = False
 
         # Wire up callbacks
@@ -40,8 +40,14 @@ class MeoMicApp:
         self.window.on_show_setup = self._show_setup_wizard
         self.window.on_volume_change = self._on_volume_change
 
-    def _on_audio_data(self, data: bytes):
+        # Drop cached device lists as soon as devices change
+        self.device_watcher.add_callback(mark_devices_changed)
+        self.device_watcher.add_callback(SetupWizard.invalidate_cache)
+
+    def _on_audio_data(self, data: memoryview):
         """Handle received audio data."""
+        if not self.audio_output.running:
+            return
         self.audio_output.write(data)
 
     def _on_client_connected(self, client_ip: str):
@@ -65,12 +71,12 @@ class MeoMicApp:
         """Handle volume change."""
         self.audio_output.set_volume(volume)
 
-    def _level_update_loop(self):
-        """Background thread to update audio level in UI."""
-        while self.running:
-            level = self.audio_output.get_level()
-            self.window.update_level(level)
-            time.sleep(0.05)
+    def _tick_level(self):
+        """Update audio level in UI every 50ms (runs on the Tk main thread)."""
+        if not self.running or not self.window.root:
+            return
+        self.window.update_level(self.audio_output.get_level())
+        self.window.root.after(50, self._tick_level)
 
     def start(self):
         """Start all components."""
@@ -86,6 +92,8 @@ class MeoMicApp:
         # Start mDNS broadcaster
         self.broadcaster.start()
 
+        self.device_watcher.start()
+
         # Get connection info
         local_ip = self.broadcaster.get_local_ip()
         if local_ip:
@@ -110,12 +118,13 @@ class MeoMicApp:
             print("No virtual audio device found.")
             print("Install VB-Cable to use as a virtual microphone.")
 
-        # Start level update thread
-        self._level_thread = threading.Thread(target=self._level_update_loop, daemon=True)
-        self._level_thread.start()
-
     def _refresh_devices(self):
         """Refresh device list after setup wizard completes."""
+        # Device enumeration can take a while - keep it off the Tk thread
+        threading.Thread(target=self._load_devices, daemon=True).start()
+
+    def _load_devices(self):
+        """Query devices and push them to the window (worker thread)."""
         devices = self.audio_output.list_devices()
         virtual_device = self.audio_output.find_virtual_device()
 
@@ -130,13 +139,16 @@ class MeoMicApp:
         """Show setup wizard if no virtual audio device found."""
         if self._setup_shown:
             return
+        self._setup_shown = True
+
+        # Device enumeration can take a while - keep it off the Tk thread
+        threading.Thread(target=self._check_setup, daemon=True).start()
 
+    def _check_setup(self):
+        """Open the setup wizard if needed (worker thread)."""
         if SetupWizard.needs_setup():
-            self._setup_shown = True
-            wizard = SetupWizard()
-            wizard.on_complete = self._refresh_devices
-            wizard.on_skip = lambda: None
-            wizard.show(self.window.root)
+            self.window.root.after(0, self._show_setup_wizard)
+
     def _show_setup_wizard(self):
         """Show setup wizard from button click."""
         wizard = SetupWizard()
@@ -152,6 +164,9 @@ class MeoMicApp:
         self.window.create_window()
         self.window.running = True
 
+        # Start level meter updates
+        self._tick_level()
+
         # Show setup wizard if needed (after window exists)
         self._show_setup_if_needed()
 
@@ -173,6 +188,7 @@ class MeoMicApp:
         self.audio_output.stop()
         self.receiver.stop()
         self.broadcaster.stop()
+        self.device_watcher.stop()
 
         print("Goodbye!")
 
@@ -183,6 +199,9 @@ class MeoMicApp:
 
 def main():
     """Entry point."""
+    # Modules that log instead of print show up on the console like the rest
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     app = MeoMicApp()
 
     def signal_handler(sig, frame):
@@ -1,13 +1,102 @@
 """
 Audio Output Module - Fixed for proper streaming
+
+Samples stay int16 from the UDP payload through the ring buffer to the
+PortAudio stream; volume is applied in Q15 fixed point.
 """
 
-import threading
+import math
 import platform
-from typing import Optional, List
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, List
 import numpy as np
 import sounddevice as sd
 
+from .audio_receiver import UdpAudioReceiver
+
+# Device name fragments that identify virtual audio cables, most common first
+_VIRTUAL_RE = re.compile(r'cable|vb-audio|virtual|blackhole|loopback|soundflower', re.IGNORECASE)
+
+
+def is_virtual_device_name(name: str) -> bool:
+    """Check if a device name looks like a virtual audio cable."""
+    return _VIRTUAL_RE.search(name) is not None
+
+
+# PortAudio only enumerates devices when it's initialized. After an OS
+# device change the next query re-initializes it - but only while no
+# stream is open, since terminating PortAudio would kill the stream.
+_devices_changed = threading.Event()
+_pa_lock = threading.Lock()
+_open_streams = 0  # Guarded by _pa_lock
+
+
+def mark_devices_changed():
+    """Flag an OS audio device change (never blocks, safe from any thread)."""
+    _devices_changed.set()
+
+
+def query_devices():
+    """sd.query_devices(), re-initializing PortAudio first if devices changed."""
+    with _pa_lock:
+        if _devices_changed.is_set() and _open_streams == 0:
+            _devices_changed.clear()
+            sd._terminate()
+            sd._initialize()
+        return sd.query_devices()
+
+
+class DeviceListCache:
+    """A device list reused for `ttl` seconds or until invalidated.
+
+    invalidate() only bumps a generation counter and never takes the
+    lock, so it doesn't wait on an enumeration in progress and is safe
+    to call from device notification callbacks.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entry: tuple = (0.0, -1, [])  # (timestamp, generation, devices)
+        self._generation = 0
+
+    def get(self, load: Callable[[], List[dict]]) -> List[dict]:
+        """Return the cached list, calling load() if it's stale."""
+        with self._lock:
+            generation = self._generation
+            ts, cached_generation, devices = self._entry
+            if cached_generation != generation or time.monotonic() - ts >= self.ttl:
+                devices = load()
+                self._entry = (time.monotonic(), generation, devices)
+            return list(devices)
+
+    def invalidate(self):
+        """Force the next get() to reload."""
+        self._generation += 1
+
+
+def _open_stream(**kwargs) -> sd.OutputStream:
+    """Open an output stream, counting it so PortAudio isn't re-initialized under it."""
+    global _open_streams
+    with _pa_lock:
+        stream = sd.OutputStream(**kwargs)
+        _open_streams += 1
+    return stream
+
+
+def _close_stream(stream: sd.OutputStream):
+    """Stop and close a stream opened with _open_stream()."""
+    global _open_streams
+    with _pa_lock:
+        try:
+            stream.stop()
+            stream.close()
+        finally:
+            _open_streams -= 1
+
 
 class AudioOutput:
     SAMPLE_RATE = 48000
@@ -17,46 +106,64 @@ class AudioOutput:
     # Larger buffer to handle network jitter - 200ms
     BUFFER_FRAMES = 1024
 
+    # Most samples one UDP packet can carry: mu-law payloads expand to one
+    # sample per byte, so this is the whole payload size, not half of it
+    MAX_CHUNK = UdpAudioReceiver.BUFFER_SIZE - UdpAudioReceiver.HEADER_SIZE
+
+    # Packets peaking below this are treated as silence for the level meter
+    SILENCE_PEAK = 64
+
     def __init__(self):
         self.output_device: Optional[int] = None
         self.stream: Optional[sd.OutputStream] = None
         self.running = False
 
-        # Simple buffer approach - accumulate samples
-        self.buffer = np.array([], dtype=np.int16)
-        self.buffer_lock = threading.Lock()
+        # Serializes stream open/close between the receive thread and the
+        # device-switch worker
+        self._stream_lock = threading.RLock()
+        self._worker = ThreadPoolExecutor(max_workers=1)
 
         # Target buffer size: ~50ms worth = 2400 samples
         # We want some buffer to handle jitter but not too much for latency
         self.target_buffer = 2400
 
+        # Limit buffer size to prevent latency buildup (max ~150ms)
+        self.max_buffer = 7200
+
+        # Lock-free single-producer/single-consumer ring buffer: the receive
+        # thread only advances _w and the audio callback only advances _r.
+        # Both count samples ever written/read, so _w - _r is the fill level.
+        # The ring holds twice max_buffer so a write never lands on samples
+        # the callback is still reading.
+        self._ring = np.empty(2 * self.max_buffer, dtype=self.DTYPE)
+        self._w = 0
+        self._r = 0
+
         # Audio level
         self.current_level: float = 0.0
 
         # Volume control (0.0 to 2.0, where 1.0 is normal)
         self.volume: float = 1.0
 
+        # Scratch space for fixed-point volume scaling
+        self._scratch_i32 = np.empty(self.MAX_CHUNK, dtype=np.int32)
+
     def list_devices(self) -> List[dict]:
         """List available output devices."""
         devices = []
         try:
-            for i, dev in enumerate(sd.query_devices()):
+            for dev in query_devices():
                 if dev['max_output_channels'] > 0:
                     devices.append({
-                        'id': i,
+                        'id': dev['index'],
                         'name': dev['name'],
                         'channels': dev['max_output_channels'],
-                        'is_virtual': self._is_virtual_device(dev['name'])
+                        'is_virtual': is_virtual_device_name(dev['name'])
                     })
         except Exception as e:
             print(f"[Audio] Error listing devices: {e}")
         return devices
 
-    def _is_virtual_device(self, name: str) -> bool:
-        """Check if device is a virtual audio device."""
-        keywords = ['cable', 'virtual', 'vb-audio', 'blackhole', 'soundflower', 'loopback']
-        return any(kw in name.lower() for kw in keywords)
-
     def find_virtual_device(self) -> Optional[int]:
         """Find a virtual audio device."""
         for dev in self.list_devices():
@@ -65,110 +172,161 @@ class AudioOutput:
         return None
 
     def set_output_device(self, device_id: Optional[int]):
-        """Set output device."""
-        was_running = self.running
-        if was_running:
-            self.stop()
+        """Set output device.
+
+        A running stream is reopened on a worker thread so the caller
+        (usually the UI) doesn't wait on PortAudio.
+        """
         self.output_device = device_id
-        if was_running:
-            self.start()
+        if self.running:
+            self._worker.submit(self._restart)
+
+    def _restart(self):
+        """Reopen the stream on the current output device."""
+        with self._stream_lock:
+            if self.running:
+                self.stop()
+                self.start()
 
     def start(self):
         """Start audio output."""
-        if self.running:
-            return
-
-        with self.buffer_lock:
-            self.buffer = np.array([], dtype=np.int16)
+        with self._stream_lock:
+            if self.running:
+                return
 
-        try:
-            self.stream = sd.OutputStream(
-                device=self.output_device,
-                samplerate=self.SAMPLE_RATE,
-                channels=self.CHANNELS,
-                dtype=self.DTYPE,
-                blocksize=self.BUFFER_FRAMES,
-                callback=self._callback
-            )
-            self.stream.start()
-            self.running = True
-
-            name = "default"
-            if self.output_device is not None:
-                name = sd.query_devices(self.output_device)['name']
-            print(f"[Audio] Started: {name}")
+            self._clear_buffer()
 
-        except Exception as e:
-            print(f"[Audio] Failed: {e}")
-            self.running = False
+            try:
+                self.stream = _open_stream(
+                    device=self.output_device,
+                    samplerate=self.SAMPLE_RATE,
+                    channels=self.CHANNELS,
+                    dtype=self.DTYPE,
+                    blocksize=self.BUFFER_FRAMES,
+                    callback=self._callback
+                )
+                self.stream.start()
+                self.running = True
+
+                name = "default"
+                if self.output_device is not None:
+                    name = sd.query_devices(self.output_device)['name']
+                print(f"[Audio] Started: {name}")
+
+            except Exception as e:
+                print(f"[Audio] Failed: {e}")
+                self.running = False
 
     def stop(self):
         """Stop audio output."""
-        self.running = False
-        if self.stream:
-            try:
-                self.stream.stop()
-                self.stream.close()
-            except:
-                pass
-            self.stream = None
-
-        with self.buffer_lock:
-            self.buffer = np.array([], dtype=np.int16)
-        self.current_level = 0.0
-
-    def write(self, audio_data: bytes):
-        """Write audio data."""
+        with self._stream_lock:
+            self.running = False
+            if self.stream:
+                try:
+                    _close_stream(self.stream)
+                except:
+                    pass
+                self.stream = None
+
+            self._clear_buffer()
+            self.current_level = 0.0
+
+    def _clear_buffer(self):
+        """Drop any buffered samples (only while the stream is stopped)."""
+        self._r = self._w
+
+    def write(self, audio_data: memoryview):
+        """Write audio data.
+
+        audio_data is only read during the call; the ring buffer write is
+        the single copy of the samples.
+        """
         if not self.running or len(audio_data) == 0:
             return
 
         try:
-            samples = np.frombuffer(audio_data, dtype=self.DTYPE).copy()
+            samples = np.frombuffer(audio_data, dtype=self.DTYPE)
+            n = len(samples)
 
-            # Apply volume
-            if self.volume != 1.0:
-                samples = (samples.astype(np.float32) * self.volume).clip(-32768, 32767).astype(np.int16)
+            if n == 0:
+                return
 
-            # Update level
-            if len(samples) > 0:
-                rms = np.sqrt(np.mean(samples.astype(np.float32) ** 2))
+            # Apply volume as a Q15 fixed-point multiply, reusing the
+            # scaled values for the level so samples are only walked once
+            if self.volume != 1.0:
+                vol_q15 = int(self.volume * 32768)
+                tmp = self._scratch_i32[:n]
+                np.multiply(samples, vol_q15, out=tmp, dtype=np.int32)
+                tmp >>= 15
+                np.clip(tmp, -32768, 32767, out=tmp)
+                samples = tmp
+
+            # Update level - near-silent packets just decay the meter
+            peak = max(int(samples.max()), -int(samples.min()))
+            if peak < self.SILENCE_PEAK:
+                self.current_level *= 0.8
+            else:
+                sum_sq = int(np.einsum('i,i->', samples, samples, dtype=np.int64))
+                rms = math.sqrt(sum_sq / n)
                 self.current_level = min(1.0, rms / 10000.0)
 
-            with self.buffer_lock:
-                # Add new samples
-                self.buffer = np.concatenate([self.buffer, samples])
-
-                # Limit buffer size to prevent latency buildup (max ~150ms)
-                max_buffer = 7200
-                if len(self.buffer) > max_buffer:
-                    # Keep only the newest samples
-                    self.buffer = self.buffer[-max_buffer:]
+            self._ring_write(samples)
 
         except Exception as e:
             print(f"[Audio] Write error: {e}")
 
+    def _ring_write(self, samples: np.ndarray):
+        """Copy samples into the ring buffer (receive thread only).
+
+        samples may be int16 or already clipped int32; copyto narrows it.
+        """
+        size = len(self._ring)
+        n = len(samples)
+        if n > self.max_buffer:
+            # Keep only the newest samples
+            samples = samples[-self.max_buffer:]
+            n = self.max_buffer
+
+        w = self._w % size
+        n1 = min(n, size - w)
+        np.copyto(self._ring[w:w + n1], samples[:n1])
+        if n > n1:
+            np.copyto(self._ring[:n - n1], samples[n1:])
+
+        # Publish only after the samples are in place
+        self._w += n
+
+    def _ring_read(self, outdata: np.ndarray, n: int):
+        """Copy n samples into outdata's first channel (audio callback only)."""
+        size = len(self._ring)
+        r = self._r % size
+        n1 = min(n, size - r)
+        np.copyto(outdata[:n1, 0], self._ring[r:r + n1])
+        if n > n1:
+            np.copyto(outdata[n1:n, 0], self._ring[:n - n1])
+        self._r += n
+
     def _callback(self, outdata: np.ndarray, frames: int, time_info, status):
         """Audio callback - called by sounddevice."""
-        with self.buffer_lock:
-            available = len(self.buffer)
-
-            if available >= frames:
-                # Have enough data
-                outdata[:, 0] = self.buffer[:frames]
-                self.buffer = self.buffer[frames:]
-            elif available > 0:
-                # Have some data, pad with last sample to avoid clicks
-                outdata[:available, 0] = self.buffer
-                # Repeat last sample or fade to zero
-                if available > 0:
-                    outdata[available:, 0] = self.buffer[-1]
-                else:
-                    outdata[available:, 0] = 0
-                self.buffer = np.array([], dtype=np.int16)
-            else:
-                # No data, output silence
-                outdata.fill(0)
-                self.current_level = 0.0
+        w = self._w
+        available = w - self._r
+
+        if available > self.max_buffer:
+            # Fell behind - drop the oldest samples to limit latency
+            self._r = w - self.max_buffer
+            available = self.max_buffer
+
+        if available >= frames:
+            # Have enough data
+            self._ring_read(outdata, frames)
+        elif available > 0:
+            # Have some data, pad with last sample to avoid clicks
+            self._ring_read(outdata, available)
+            outdata[available:, 0] = outdata[available - 1, 0]
+        else:
+            # No data, output silence
+            outdata.fill(0)
+            self.current_level = 0.0
 
     def get_level(self) -> float:
         """Get audio level."""
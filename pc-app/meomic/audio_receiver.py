@@ -6,11 +6,14 @@ Packet format matches the Android UdpAudioStreamer:
 - Header (8 bytes):
   - Magic bytes: "WM" (2 bytes)
   - Version: 1 byte
-  - Packet type: 1 byte (0=audio, 1=keepalive, 2=disconnect)
+  - Packet type: 1 byte (0=audio, 1=keepalive, 2=disconnect, 4=mu-law audio)
   - Sequence number: 4 bytes
-- Payload: PCM audio data (16-bit, 48kHz, mono)
+- Payload: PCM audio data (16-bit, 48kHz, mono), or G.711 mu-law bytes
+  (8-bit, 48kHz, mono) for type 4, decoded here to 16-bit PCM
 """
 
+import os
+import select
 import socket
 import struct
 import threading
@@ -18,6 +21,12 @@ import time
 from typing import Callable, Optional
 from dataclasses import dataclass
 from enum import IntEnum
+import numpy as np
+
+# Packet header: Magic (2) + Version (1) + Type (1) + Sequence (4)
+# The magic is read as a u16 so validating it is a plain int compare
+_HEADER = struct.Struct('>HBBI')
+_MAGIC_WORD = 0x574D  # b'WM'
 
 
 class PacketType(IntEnum):
@@ -25,6 +34,27 @@ class PacketType(IntEnum):
     KEEPALIVE = 1
     DISCONNECT = 2
     ACK = 3
+    AUDIO_MULAW = 4
+
+
+# Plain int copies of PacketType for the per-packet dispatch
+_AUDIO = int(PacketType.AUDIO)
+_KEEPALIVE = int(PacketType.KEEPALIVE)
+_DISCONNECT = int(PacketType.DISCONNECT)
+_ACK = int(PacketType.ACK)
+_AUDIO_MULAW = int(PacketType.AUDIO_MULAW)
+
+
+def _build_mulaw_table() -> np.ndarray:
+    """Build the G.711 mu-law byte -> int16 sample lookup table."""
+    u = np.invert(np.arange(256, dtype=np.uint8)).astype(np.int32)
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+_MULAW_TABLE = _build_mulaw_table()
 
 
 @dataclass
@@ -39,6 +69,8 @@ class UdpAudioReceiver:
     HEADER_SIZE = 8
     DEFAULT_PORT = 48888
     BUFFER_SIZE = 65536
+    # Kernel receive buffer - ~10s of audio so UI stalls don't drop packets
+    RCVBUF_SIZE = 1 << 20
 
     def __init__(self, port: int = DEFAULT_PORT):
         self.port = port
@@ -46,8 +78,14 @@ class UdpAudioReceiver:
         self.running = False
         self.receive_thread: Optional[threading.Thread] = None
 
+        # Preallocated receive buffer, reused for every datagram
+        self._rxbuf = bytearray(self.BUFFER_SIZE)
+        self._rxview = memoryview(self._rxbuf)
+
         # Callbacks
-        self.on_audio_data: Optional[Callable[[bytes], None]] = None
+        # on_audio_data gets a view into the receive buffer that is only
+        # valid for the duration of the call - copy it to keep it
+        self.on_audio_data: Optional[Callable[[memoryview], None]] = None
         self.on_client_connected: Optional[Callable[[str], None]] = None
         self.on_client_disconnected: Optional[Callable[[], None]] = None
 
@@ -67,8 +105,8 @@ class UdpAudioReceiver:
 
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.BUFFER_SIZE)
-        self.socket.settimeout(1.0)  # 1 second timeout for clean shutdown
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF_SIZE)
+        self.socket.setblocking(False)  # Waits happen in select() in _receive_loop
         self.socket.bind(('0.0.0.0', self.port))
 
         self.running = True
@@ -89,33 +127,51 @@ class UdpAudioReceiver:
 
     def _receive_loop(self):
         """Main receive loop running in a separate thread."""
+        self._raise_thread_priority()
+
         while self.running:
             try:
-                data, addr = self.socket.recvfrom(self.BUFFER_SIZE)
-                self._handle_packet(data, addr)
-            except socket.timeout:
-                # Check for client timeout (no packets for 5 seconds)
-                if self.client_address and time.time() - self.last_packet_time > 5.0:
-                    self._handle_disconnect()
-            except OSError:
+                # 1 second timeout for clean shutdown
+                readable, _, _ = select.select([self.socket], [], [], 1.0)
+                if not readable:
+                    # Check for client timeout (no packets for 5 seconds)
+                    if self.client_address and time.monotonic() - self.last_packet_time > 5.0:
+                        self._handle_disconnect()
+                    continue
+
+                # Drain every datagram already queued before waiting again
+                while True:
+                    try:
+                        nbytes, addr = self.socket.recvfrom_into(self._rxbuf)
+                    except BlockingIOError:
+                        break
+                    self._handle_packet(self._rxview[:nbytes], addr)
+            except (OSError, ValueError):
                 # Socket closed
                 break
             except Exception as e:
                 print(f"[Receiver] Error: {e}")
 
-    def _handle_packet(self, data: bytes, addr: tuple):
+    def _raise_thread_priority(self):
+        """Best-effort real-time scheduling for the receive thread (Linux)."""
+        if not hasattr(os, 'sched_setscheduler'):
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+        except OSError:
+            pass  # Needs CAP_SYS_NICE, run at normal priority otherwise
+
+    def _handle_packet(self, data: memoryview, addr: tuple):
         """Parse and handle an incoming packet."""
         if len(data) < self.HEADER_SIZE:
             return
 
         # Parse header
-        magic = data[0:2]
-        if magic != self.MAGIC:
+        magic, version, packet_type, sequence = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC_WORD:
             return
 
-        version = data[2]
-        packet_type = data[3]
-        sequence = struct.unpack('>I', data[4:8])[0]
+        now = time.monotonic()
 
         # Track new client connection
         if self.client_address != addr:
@@ -127,7 +183,7 @@ class UdpAudioReceiver:
             if self.on_client_connected:
                 self.on_client_connected(addr[0])
 
-        self.last_packet_time = time.time()
+        self.last_packet_time = now
         self.packets_received += 1
 
         # Track packet loss
@@ -140,22 +196,24 @@ class UdpAudioReceiver:
         self.last_sequence = sequence
 
         # Handle by packet type
-        if packet_type == PacketType.AUDIO:
-            audio_data = data[self.HEADER_SIZE:]
-            if audio_data and self.on_audio_data:
-                self.on_audio_data(audio_data)
+        if packet_type == _AUDIO or packet_type == _AUDIO_MULAW:
+            if self.on_audio_data and len(data) > self.HEADER_SIZE:
+                payload = data[self.HEADER_SIZE:]
+                if packet_type == _AUDIO_MULAW:
+                    # Expand to 16-bit PCM with a single table lookup
+                    payload = memoryview(_MULAW_TABLE[np.frombuffer(payload, dtype=np.uint8)])
+                self.on_audio_data(payload)
 
             # Send periodic ACKs during streaming (every 500ms)
-            current_time = time.time()
-            if current_time - self.last_ack_time > 0.5:
+            if now - self.last_ack_time > 0.5:
                 self._send_ack(addr)
-                self.last_ack_time = current_time
+                self.last_ack_time = now
 
-        elif packet_type == PacketType.KEEPALIVE:
+        elif packet_type == _KEEPALIVE:
             # Send ACK back for connection verification
             self._send_ack(addr)
 
-        elif packet_type == PacketType.DISCONNECT:
+        elif packet_type == _DISCONNECT:
             self._handle_disconnect()
 
     def _send_ack(self, addr: tuple):
@@ -163,12 +221,10 @@ class UdpAudioReceiver:
         if self.socket:
             try:
                 # Build proper ACK packet with header
-                # Format: Magic (2) + Version (1) + Type (1) + Sequence (4)
-                ack_packet = struct.pack(
-                    '>2sBBI',
-                    self.MAGIC,
+                ack_packet = _HEADER.pack(
+                    _MAGIC_WORD,
                     1,  # Version
-                    PacketType.ACK,
+                    _ACK,
                     self.ack_sequence
                 )
                 self.ack_sequence = (self.ack_sequence + 1) & 0xFFFFFFFF
@@ -0,0 +1,165 @@
+"""
+Audio Device Change Watcher
+
+Calls back whenever audio endpoints are added, removed or change state,
+so cached device lists can be dropped precisely instead of on a timer.
+
+Only Windows is supported (IMMNotificationClient via comtypes). Elsewhere,
+or if comtypes is missing, the watcher does nothing and callers keep
+relying on their cache TTLs.
+"""
+
+import logging
+import sys
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _make_windows_backend():
+    """Build the COM classes for endpoint notifications (imports comtypes)."""
+    import comtypes
+    import comtypes.client
+    from comtypes import COMMETHOD, COMObject, GUID, HRESULT, IUnknown
+    from ctypes import POINTER, Structure, c_void_p
+    from ctypes.wintypes import DWORD, LPCWSTR, UINT
+
+    class PROPERTYKEY(Structure):
+        _fields_ = [('fmtid', GUID), ('pid', DWORD)]
+
+    class IMMNotificationClient(IUnknown):
+        _iid_ = GUID('{7991EEC9-7E89-4D85-8390-6C703CEC60C0}')
+        _methods_ = [
+            COMMETHOD([], HRESULT, 'OnDeviceStateChanged',
+                      (['in'], LPCWSTR, 'pwstrDeviceId'),
+                      (['in'], DWORD, 'dwNewState')),
+            COMMETHOD([], HRESULT, 'OnDeviceAdded',
+                      (['in'], LPCWSTR, 'pwstrDeviceId')),
+            COMMETHOD([], HRESULT, 'OnDeviceRemoved',
+                      (['in'], LPCWSTR, 'pwstrDeviceId')),
+            COMMETHOD([], HRESULT, 'OnDefaultDeviceChanged',
+                      (['in'], UINT, 'flow'),
+                      (['in'], UINT, 'role'),
+                      (['in'], LPCWSTR, 'pwstrDefaultDeviceId')),
+            COMMETHOD([], HRESULT, 'OnPropertyValueChanged',
+                      (['in'], LPCWSTR, 'pwstrDeviceId'),
+                      (['in'], PROPERTYKEY, 'key')),
+        ]
+
+    class IMMDeviceEnumerator(IUnknown):
+        _iid_ = GUID('{A95664D2-9614-4F35-A746-DE8DB63617E6}')
+        _methods_ = [
+            # Only the notification methods are called; the rest keep the vtable order
+            COMMETHOD([], HRESULT, 'EnumAudioEndpoints',
+                      (['in'], UINT, 'dataFlow'),
+                      (['in'], DWORD, 'dwStateMask'),
+                      (['out'], POINTER(c_void_p), 'ppDevices')),
+            COMMETHOD([], HRESULT, 'GetDefaultAudioEndpoint',
+                      (['in'], UINT, 'dataFlow'),
+                      (['in'], UINT, 'role'),
+                      (['out'], POINTER(c_void_p), 'ppEndpoint')),
+            COMMETHOD([], HRESULT, 'GetDevice',
+                      (['in'], LPCWSTR, 'pwstrId'),
+                      (['out'], POINTER(c_void_p), 'ppDevice')),
+            COMMETHOD([], HRESULT, 'RegisterEndpointNotificationCallback',
+                      (['in'], POINTER(IMMNotificationClient), 'pClient')),
+            COMMETHOD([], HRESULT, 'UnregisterEndpointNotificationCallback',
+                      (['in'], POINTER(IMMNotificationClient), 'pClient')),
+        ]
+
+    CLSID_MMDeviceEnumerator = GUID('{BCDE0395-E52F-467C-8E3D-C4579291692E}')
+
+    class NotificationClient(COMObject):
+        _com_interfaces_ = [IMMNotificationClient]
+
+        def __init__(self, on_change: Callable[[], None]):
+            super().__init__()
+            self._on_change = on_change
+
+        def OnDeviceStateChanged(self, device_id, new_state):
+            self._on_change()
+            return 0
+
+        def OnDeviceAdded(self, device_id):
+            self._on_change()
+            return 0
+
+        def OnDeviceRemoved(self, device_id):
+            self._on_change()
+            return 0
+
+        def OnDefaultDeviceChanged(self, flow, role, device_id):
+            return 0  # Device list is unchanged
+
+        def OnPropertyValueChanged(self, device_id, key):
+            return 0  # Fires constantly; names are refreshed on add/remove anyway
+
+    def run(on_change: Callable[[], None], stop_event: threading.Event):
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        try:
+            enumerator = comtypes.client.CreateObject(
+                CLSID_MMDeviceEnumerator, interface=IMMDeviceEnumerator)
+            client = NotificationClient(on_change)
+            enumerator.RegisterEndpointNotificationCallback(client)
+            try:
+                stop_event.wait()
+            finally:
+                enumerator.UnregisterEndpointNotificationCallback(client)
+        finally:
+            comtypes.CoUninitialize()
+
+    return run
+
+
+class DeviceWatcher:
+    """Invoke callbacks when the set of audio devices changes."""
+
+    def __init__(self):
+        self._callbacks: List[Callable[[], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Register a callback.
+
+        Callbacks run on the COM notification thread and must not block
+        (no locks held across device enumeration, no device queries).
+        """
+        self._callbacks.append(callback)
+
+    def _notify(self):
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error("[DeviceWatcher] Callback failed: %s", e)
+
+    def start(self) -> bool:
+        """Start watching. Returns False if unsupported on this system."""
+        if self._thread or sys.platform != 'win32':
+            return False
+
+        try:
+            run = _make_windows_backend()
+        except ImportError:
+            logger.info("[DeviceWatcher] comtypes not installed, using cache timeouts")
+            return False
+
+        def worker():
+            try:
+                run(self._notify, self._stop_event)
+            except Exception as e:
+                logger.warning("[DeviceWatcher] Stopped: %s", e)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=worker, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop watching."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
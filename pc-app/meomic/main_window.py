@@ -2,9 +2,11 @@
 Meo Mic - Modern Main Window GUI
 """
 
+import tkinter as tk
 import customtkinter as ctk
 import threading
 import os
+from functools import partial
 import sys
 from typing import Optional, Callable, List
 
@@ -12,6 +14,17 @@ from typing import Optional, Callable, List
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Menu prefix marking virtual devices
+_STAR = "★ "
+
+# Window icon - the install layout doesn't change, so look it up once
+_ICON_PATH = next((p for p in (
+    os.path.join(os.path.dirname(sys.executable), 'icon.ico'),
+    os.path.join(os.path.dirname(__file__), '..', 'icon.ico'),
+    os.path.join(os.path.dirname(__file__), 'icon.ico'),
+    'icon.ico'
+) if os.path.exists(p)), None)
+
 
 class MainWindow:
     def __init__(self):
@@ -23,6 +36,7 @@ class MainWindow:
         self.client_ip: Optional[str] = None
         self.local_ip: Optional[str] = None
         self.port: int = 48888
+        self._addr_str: str = ""
         self.audio_level: float = 0.0
 
         # Callbacks
@@ -31,12 +45,24 @@ class MainWindow:
         self.on_quit: Optional[Callable] = None
         self.on_show_setup: Optional[Callable] = None
 
-        # Devices - stored for later application
-        self.devices: List[dict] = []
+        # Devices - passed to the menu as parallel id/name/virtual lists
         self.selected_device: Optional[int] = None
+        self._name_to_id: dict = {}
         self._pending_devices: Optional[tuple] = None
         self._pending_connection_info: Optional[tuple] = None
 
+        # Coalesced UI updates - at most one queued flush per field
+        self._level_pending = False
+        self._status_pending = False
+        self._conn_pending = False
+        self._copy_reset_id: Optional[str] = None
+
+        # Last state applied to widgets - skip configure() when unchanged
+        self._last_status: Optional[tuple] = None
+        self._last_level: float = 0.0
+        self._last_conn: Optional[tuple] = None
+        self._last_devices: Optional[tuple] = None
+
         # UI elements
         self.status_label: Optional[ctk.CTkLabel] = None
         self.status_dot: Optional[ctk.CTkLabel] = None
@@ -44,6 +70,7 @@ class MainWindow:
         self.level_bar: Optional[ctk.CTkProgressBar] = None
         self.device_menu: Optional[ctk.CTkOptionMenu] = None
         self.copy_btn: Optional[ctk.CTkButton] = None
+        self._main: Optional[ctk.CTkFrame] = None
         self.volume_slider: Optional[ctk.CTkSlider] = None
         self.volume_label: Optional[ctk.CTkLabel] = None
 
@@ -53,14 +80,12 @@ class MainWindow:
         """Create the main window."""
         self.root = ctk.CTk()
         self.root.title("Meo Mic")
-        self.root.geometry("380x620")
         self.root.resizable(False, False)
 
         # Set window icon
         self._set_icon()
 
-        # Center on screen
-        self.root.update_idletasks()
+        # Center on screen - screen size doesn't need a laid-out window
         x = (self.root.winfo_screenwidth() - 380) // 2
         y = (self.root.winfo_screenheight() - 620) // 2
         self.root.geometry(f"380x620+{x}+{y}")
@@ -69,10 +94,27 @@ class MainWindow:
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Main container
-        main = ctk.CTkFrame(self.root, fg_color="transparent")
-        main.pack(fill="both", expand=True, padx=25, pady=25)
+        self._main = ctk.CTkFrame(self.root, fg_color="transparent")
+        self._main.pack(fill="both", expand=True, padx=25, pady=25)
+
+        # Build what the user sees first now, the rest once the window is up
+        self._build_header(self._main)
+        self._build_status(self._main)
+        self._build_ip(self._main)
+        self.root.after_idle(self._build_secondary)
+
+    def _build_secondary(self):
+        """Build the remaining sections, then apply any pending data."""
+        self._build_level(self._main)
+        self._build_volume(self._main)
+        self._build_devices(self._main)
+        self._build_buttons(self._main)
+
+        # Apply any pending data
+        self._apply_pending_data()
 
-        # ===== Header =====
+    def _build_header(self, main: ctk.CTkFrame):
+        """Build the title header."""
         header = ctk.CTkFrame(main, fg_color="transparent")
         header.pack(fill="x", pady=(0, 20))
 
@@ -91,7 +133,8 @@ class MainWindow:
         )
         subtitle.pack()
 
-        # ===== Status Card =====
+    def _build_status(self, main: ctk.CTkFrame):
+        """Build the connection status card."""
         status_card = ctk.CTkFrame(main, corner_radius=12)
         status_card.pack(fill="x", pady=10)
 
@@ -113,7 +156,8 @@ class MainWindow:
         )
         self.status_label.pack(side="left")
 
-        # ===== IP Address =====
+    def _build_ip(self, main: ctk.CTkFrame):
+        """Build the IP address display and copy button."""
         ip_section = ctk.CTkFrame(main, fg_color="transparent")
         ip_section.pack(fill="x", pady=10)
 
@@ -134,7 +178,8 @@ class MainWindow:
         )
         self.copy_btn.pack(pady=10)
 
-        # ===== Audio Level =====
+    def _build_level(self, main: ctk.CTkFrame):
+        """Build the audio level meter."""
         level_section = ctk.CTkFrame(main, fg_color="transparent")
         level_section.pack(fill="x", pady=15)
 
@@ -155,7 +200,8 @@ class MainWindow:
         self.level_bar.pack(pady=8)
         self.level_bar.set(0)
 
-        # ===== Volume Control =====
+    def _build_volume(self, main: ctk.CTkFrame):
+        """Build the volume slider."""
         volume_section = ctk.CTkFrame(main, fg_color="transparent")
         volume_section.pack(fill="x", pady=10)
 
@@ -190,7 +236,8 @@ class MainWindow:
         self.volume_slider.pack(pady=8)
         self.volume_slider.set(100)
 
-        # ===== Device Selection =====
+    def _build_devices(self, main: ctk.CTkFrame):
+        """Build the output device menu."""
         device_section = ctk.CTkFrame(main, fg_color="transparent")
         device_section.pack(fill="x", pady=10)
 
@@ -212,7 +259,8 @@ class MainWindow:
         )
         self.device_menu.pack(fill="x", pady=5)
 
-        # ===== Bottom Buttons =====
+    def _build_buttons(self, main: ctk.CTkFrame):
+        """Build the Quit and setup buttons."""
         bottom_frame = ctk.CTkFrame(main, fg_color="transparent")
         bottom_frame.pack(side="bottom", fill="x", pady=10)
 
@@ -242,9 +290,6 @@ class MainWindow:
         )
         setup_btn.pack(side="right")
 
-        # Apply any pending data
-        self._apply_pending_data()
-
     def _apply_pending_data(self):
         """Apply data that was set before window was created."""
         if self._pending_connection_info:
@@ -253,38 +298,41 @@ class MainWindow:
             self._pending_connection_info = None
 
         if self._pending_devices:
-            devices, selected = self._pending_devices
-            self._do_set_devices(devices, selected)
+            self._do_set_devices(*self._pending_devices)
             self._pending_devices = None
 
     def _copy_ip(self):
         """Copy IP to clipboard."""
         if self.local_ip and self.root:
-            text = f"{self.local_ip}:{self.port}"
             self.root.clipboard_clear()
-            self.root.clipboard_append(text)
+            self.root.clipboard_append(self._addr_str)
             self.copy_btn.configure(text="Copied!")
-            self.root.after(1000, lambda: self.copy_btn.configure(text="Copy IP"))
+            # Restart the reset timer so repeated clicks don't stack resets
+            if self._copy_reset_id:
+                self.root.after_cancel(self._copy_reset_id)
+            self._copy_reset_id = self.root.after(1000, self._reset_copy_text)
+
+    def _reset_copy_text(self):
+        """Restore the copy button label."""
+        self._copy_reset_id = None
+        if self.copy_btn:
+            self.copy_btn.configure(text="Copy IP")
 
     def _on_device_selected(self, choice: str):
         """Handle device selection."""
-        if self.on_device_change and self.devices:
-            for dev in self.devices:
-                name = dev['name']
-                if dev['is_virtual']:
-                    name = f"★ {name}"
-                if name == choice:
-                    self.selected_device = dev['id']
-                    self.on_device_change(dev['id'])
-                    break
+        # The menu now shows the user's choice, not the last applied state
+        self._last_devices = None
+        dev_id = self._name_to_id.get(choice)
+        if self.on_device_change and dev_id is not None and dev_id != self.selected_device:
+            self.selected_device = dev_id
+            self.on_device_change(dev_id)
 
     def _on_close(self):
         """Handle window close."""
-        self.running = False
+        self.stop()
         if self.on_quit:
             self.on_quit()
         if self.root:
-            self.root.quit()
             self.root.destroy()
 
     def _on_show_setup(self):
@@ -295,19 +343,8 @@ class MainWindow:
     def _set_icon(self):
         """Set the window icon."""
         try:
-            # Try to find icon in various locations
-            icon_paths = [
-                os.path.join(os.path.dirname(sys.executable), 'icon.ico'),
-                os.path.join(os.path.dirname(__file__), '..', 'icon.ico'),
-                os.path.join(os.path.dirname(__file__), 'icon.ico'),
-                'icon.ico'
-            ]
-
-            for icon_path in icon_paths:
-                if os.path.exists(icon_path):
-                    self.root.iconbitmap(icon_path)
-                    return
-
+            if _ICON_PATH:
+                self.root.iconbitmap(_ICON_PATH)
         except Exception:
             pass  # Icon is optional, continue without it
 
@@ -323,43 +360,57 @@ class MainWindow:
         """Set connection info (thread-safe)."""
         self.local_ip = ip
         self.port = port
+        self._addr_str = f"{ip}:{port}"
 
         if self.root and self.ip_label:
-            # Use after() for thread safety
-            self.root.after(0, lambda: self._do_set_connection_info(ip, port))
+            # Use after_idle() for thread safety; the flush reads the latest values
+            if not self._conn_pending:
+                self._conn_pending = True
+                self.root.after_idle(self._flush_connection_info)
         else:
             self._pending_connection_info = (ip, port)
 
+    def _flush_connection_info(self):
+        """Apply the latest connection info (main thread)."""
+        self._conn_pending = False
+        self._do_set_connection_info(self.local_ip, self.port)
+
     def _do_set_connection_info(self, ip: str, port: int):
         """Actually update the UI (must be called from main thread)."""
-        if self.ip_label:
-            self.ip_label.configure(text=f"{ip}:{port}")
+        if self.ip_label and (ip, port) != self._last_conn:
+            self._last_conn = (ip, port)
+            self.ip_label.configure(text=self._addr_str)
 
     def set_devices(self, devices: List[dict], selected: Optional[int] = None):
         """Set devices list (thread-safe)."""
-        self.devices = devices
+        ids = [d['id'] for d in devices]
+        names = [d['name'] for d in devices]
+        virtual = [d['is_virtual'] for d in devices]
         self.selected_device = selected
 
         if self.root and self.device_menu:
-            self.root.after(0, lambda: self._do_set_devices(devices, selected))
+            self.root.after(0, partial(self._do_set_devices, ids, names, virtual, selected))
         else:
-            self._pending_devices = (devices, selected)
+            self._pending_devices = (ids, names, virtual, selected)
 
-    def _do_set_devices(self, devices: List[dict], selected: Optional[int]):
+    def _do_set_devices(self, ids: List[int], names: List[str], virtual: List[bool],
+                        selected: Optional[int]):
         """Actually update device menu (must be called from main thread)."""
         if not self.device_menu:
             return
 
-        names = []
-        selected_name = None
+        names = [_STAR + name if is_virtual else name for name, is_virtual in zip(names, virtual)]
+        selected_name = names[ids.index(selected)] if selected in ids else None
+        # First match wins - Windows lists an endpoint once per host API
+        name_to_id = {}
+        for name, dev_id in zip(names, ids):
+            name_to_id.setdefault(name, dev_id)
+        self._name_to_id = name_to_id
 
-        for dev in devices:
-            name = dev['name']
-            if dev['is_virtual']:
-                name = f"★ {name}"
-            names.append(name)
-            if dev['id'] == selected:
-                selected_name = name
+        state = (tuple(names), selected_name)
+        if state == self._last_devices:
+            return
+        self._last_devices = state
 
         if names:
             self.device_menu.configure(values=names)
@@ -376,12 +427,21 @@ class MainWindow:
         self.is_connected = connected
         self.client_ip = client_ip
 
-        if self.root:
-            self.root.after(0, lambda: self._do_update_status(connected, client_ip))
+        if self.root and not self._status_pending:
+            self._status_pending = True
+            self.root.after_idle(self._flush_status)
+
+    def _flush_status(self):
+        """Apply the latest connection status (main thread)."""
+        self._status_pending = False
+        self._do_update_status(self.is_connected, self.client_ip)
 
     def _do_update_status(self, connected: bool, client_ip: Optional[str]):
         """Actually update status (must be called from main thread)."""
         if self.status_dot and self.status_label:
+            if (connected, client_ip) == self._last_status:
+                return
+            self._last_status = (connected, client_ip)
             if connected:
                 self.status_dot.configure(text_color="#4ADE80")
                 self.status_label.configure(text=f"Connected: {client_ip}")
@@ -391,9 +451,22 @@ class MainWindow:
 
     def update_level(self, level: float):
         """Update audio level (thread-safe)."""
+        # Quantize to 1% - finer changes don't move the bar by a pixel
+        level = round(min(1.0, level) * 100) / 100.0
         self.audio_level = level
+        if level == self._last_level:
+            return
         if self.root and self.level_bar:
-            self.root.after(0, lambda: self.level_bar.set(min(1.0, level)))
+            self._last_level = level
+            if not self._level_pending:
+                self._level_pending = True
+                self.root.after_idle(self._flush_level)
+
+    def _flush_level(self):
+        """Apply the latest audio level (main thread)."""
+        self._level_pending = False
+        if self.level_bar:
+            self.level_bar.set(self.audio_level)
 
     def run(self):
         """Run the window."""
@@ -402,10 +475,12 @@ class MainWindow:
         self.root.mainloop()
 
     def stop(self):
-        """Stop the window."""
+        """Stop the window (safe to call more than once)."""
+        if not self.running:
+            return
         self.running = False
         if self.root:
             try:
                 self.root.quit()
-            except:
-                pass
+            except tk.TclError:
+                pass  # Already destroyed
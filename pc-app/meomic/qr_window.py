@@ -8,36 +8,63 @@ Uses tkinter for a simple, cross-platform window.
 import tkinter as tk
 from tkinter import ttk
 import io
+from typing import Optional
+from collections import OrderedDict
 from PIL import Image, ImageTk
 import qrcode
 
+# Recently generated QR images keyed by (ip, port, size), oldest first
+_QR_CACHE_SIZE = 8
+_qr_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+
 
 def generate_qr_code(ip: str, port: int, size: int = 256) -> Image.Image:
     """Generate a QR code image for the connection info."""
+    key = (ip, port, size)
+    img = _qr_cache.get(key)
+    if img is not None:
+        _qr_cache.move_to_end(key)
+        return img.copy()
+
     # Format: meomic://IP:PORT
     data = f"meomic://{ip}:{port}"
 
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
+        box_size=1,
         border=2,
     )
     qr.add_data(data)
     qr.make(fit=True)
 
-    img = qr.make_image(fill_color="black", back_color="white")
+    # Pick the largest whole box size that fits, so no resize is needed
+    qr.box_size = max(1, size // (qr.modules_count + 2 * qr.border))
+
+    img = qr.make_image(fill_color="black", back_color="white").get_image()
+
+    _qr_cache[key] = img
+    if len(_qr_cache) > _QR_CACHE_SIZE:
+        _qr_cache.popitem(last=False)
+
+    # Copy so callers can't modify the cached image
+    return img.copy()
 
-    # Resize to desired size
-    img = img.resize((size, size), Image.Resampling.NEAREST)
 
-    return img
+def show_qr_window(ip: str, port: int, parent: Optional[tk.Misc] = None):
+    """Show a window with the QR code and connection info.
 
+    With a parent, the window is a Toplevel driven by the parent's event
+    loop and this returns immediately. Without one, an existing Tk root
+    is reused the same way; only if there is none does it start its own
+    Tk instance and block until closed.
+    """
+    # Reuse a running interpreter rather than starting a second one
+    if parent is None:
+        parent = tk._default_root
 
-def show_qr_window(ip: str, port: int):
-    """Show a window with the QR code and connection info."""
     # Create window
-    window = tk.Tk()
+    window = tk.Toplevel(parent) if parent is not None else tk.Tk()
     window.title("Meo Mic - Connect")
     window.resizable(False, False)
 
@@ -54,7 +81,7 @@ def show_qr_window(ip: str, port: int):
     window.attributes('-topmost', True)
 
     # Style
-    style = ttk.Style()
+    style = ttk.Style(window)
     style.configure('Title.TLabel', font=('Segoe UI', 16, 'bold'))
     style.configure('Info.TLabel', font=('Segoe UI', 11))
     style.configure('IP.TLabel', font=('Consolas', 14, 'bold'))
@@ -97,8 +124,9 @@ def show_qr_window(ip: str, port: int):
     # Close on Escape
     window.bind('<Escape>', lambda e: window.destroy())
 
-    # Run
-    window.mainloop()
+    # Run standalone windows; a parent's loop already drives a Toplevel
+    if parent is None:
+        window.mainloop()
 
 
 if __name__ == "__main__":
@@ -5,67 +5,108 @@ Broadcasts the MeoMic service so Android devices can auto-discover the PC.
 Uses the same service type as the Android NSD discovery: "_meomic._udp.local."
 """
 
+import logging
 import socket
 import platform
+import threading
 from typing import Optional
-from zeroconf import ServiceInfo, Zeroconf
+from zeroconf import IPVersion, ServiceInfo, Zeroconf
+
+logger = logging.getLogger(__name__)
 
 
 class ServiceBroadcaster:
     SERVICE_TYPE = "_meomic._udp.local."
     SERVICE_NAME = "MeoMic"
 
+    # Local IP shared by all instances - the LAN address rarely changes
+    _cached_ip: Optional[str] = None
+
     def __init__(self, port: int = 48888):
         self.port = port
         self.zeroconf: Optional[Zeroconf] = None
         self.service_info: Optional[ServiceInfo] = None
         self.local_ip: Optional[str] = None
 
+        # Set whenever no registration is in progress
+        self._ready = threading.Event()
+        self._ready.set()
+
     def start(self):
-        """Start broadcasting the service."""
+        """Start broadcasting the service.
+
+        The local IP is resolved immediately; Zeroconf setup and
+        registration (which waits out mDNS probing) run in the background.
+        """
         self.local_ip = self._get_local_ip()
         if not self.local_ip:
-            print("[Broadcaster] Warning: Could not determine local IP")
+            logger.warning("[Broadcaster] Could not determine local IP")
             return
 
-        hostname = platform.node()
-        service_name = f"{self.SERVICE_NAME} ({hostname}).{self.SERVICE_TYPE}"
-
-        self.service_info = ServiceInfo(
-            self.SERVICE_TYPE,
-            service_name,
-            addresses=[socket.inet_aton(self.local_ip)],
-            port=self.port,
-            properties={
-                'version': '1',
-                'platform': platform.system(),
-                'hostname': hostname,
-            },
-            server=f"{hostname}.local.",
-        )
-
-        self.zeroconf = Zeroconf()
-        self.zeroconf.register_service(self.service_info)
+        self._ready.clear()
+        threading.Thread(target=self._register, daemon=True).start()
 
-        print(f"[Broadcaster] Service registered: {service_name}")
-        print(f"[Broadcaster] IP: {self.local_ip}, Port: {self.port}")
+    def _register(self):
+        """Create the Zeroconf instance and register the service (worker thread)."""
+        try:
+            hostname = platform.node()
+            service_name = f"{self.SERVICE_NAME} ({hostname}).{self.SERVICE_TYPE}"
+
+            service_info = ServiceInfo(
+                self.SERVICE_TYPE,
+                service_name,
+                addresses=[socket.inet_aton(self.local_ip)],
+                port=self.port,
+                properties={
+                    'version': '1',
+                    'platform': platform.system(),
+                    'hostname': hostname,
+                },
+                server=f"{hostname}.local.",
+            )
+
+            # Only announce on the LAN interface we detected, IPv4 only
+            zeroconf = Zeroconf(interfaces=[self.local_ip], ip_version=IPVersion.V4Only)
+            zeroconf.register_service(service_info)
+            self.zeroconf = zeroconf
+            self.service_info = service_info
+
+            logger.info("[Broadcaster] Service registered: %s", service_name)
+            logger.info("[Broadcaster] IP: %s, Port: %d", self.local_ip, self.port)
+        except Exception as e:
+            logger.error("[Broadcaster] Failed to register service: %s", e)
+        finally:
+            self._ready.set()
 
     def stop(self):
         """Stop broadcasting the service."""
+        # Let an in-flight registration finish so it can be unregistered
+        self._ready.wait(timeout=2.0)
         if self.zeroconf and self.service_info:
             self.zeroconf.unregister_service(self.service_info)
             self.zeroconf.close()
             self.zeroconf = None
             self.service_info = None
-            print("[Broadcaster] Service unregistered")
+            logger.info("[Broadcaster] Service unregistered")
 
     def _get_local_ip(self) -> Optional[str]:
+        """Get the local LAN IP, probing only on first use."""
+        if ServiceBroadcaster._cached_ip is None:
+            ServiceBroadcaster._cached_ip = self._probe_local_ip()
+        return ServiceBroadcaster._cached_ip
+
+    def refresh(self) -> Optional[str]:
+        """Re-detect the local IP (e.g. after a network change)."""
+        ServiceBroadcaster._cached_ip = None
+        self.local_ip = self._get_local_ip()
+        return self.local_ip
+
+    def _probe_local_ip(self) -> Optional[str]:
         """Get the local IP address that's most likely on the LAN."""
         try:
             # Create a socket and connect to an external address
             # This doesn't actually send data, just determines the route
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.settimeout(0.1)
             try:
                 s.connect(('8.8.8.8', 80))
                 ip = s.getsockname()[0]
@@ -78,13 +119,18 @@ class ServiceBroadcaster:
         # Fallback: try to get from hostname
         try:
             hostname = socket.gethostname()
-            ip = socket.gethostbyname(hostname)
-            if not ip.startswith('127.'):
-                return ip
+            for info in socket.getaddrinfo(hostname, None, socket.AF_INET):
+                ip = info[4][0]
+                if not ip.startswith('127.'):
+                    return ip
         except Exception:
             pass
 
         # Last resort: enumerate interfaces
+        return self._ip_from_interfaces()
+
+    def _ip_from_interfaces(self) -> Optional[str]:
+        """Find a LAN IP by enumerating interfaces (imports psutil)."""
         try:
             import psutil
             for iface, addrs in psutil.net_if_addrs().items():
@@ -4,10 +4,17 @@ Meo Mic - First-Run Setup Wizard
 Helps users install and understand VB-Cable virtual audio driver.
 """
 
+import tkinter as tk
 import customtkinter as ctk
+import threading
 import webbrowser
+from functools import partial
 from typing import Optional, Callable, List
-import sounddevice as sd
+
+from .audio_output import DeviceListCache, is_virtual_device_name, query_devices
+
+# Device enumeration is slow on some backends - reuse results for a few seconds
+_devices_cache = DeviceListCache(ttl=5.0)
 
 
 class SetupWizard:
@@ -15,6 +22,9 @@ class SetupWizard:
 
     VB_CABLE_URL = "https://vb-audio.com/Cable/"
 
+    # Shared font objects, keyed by (size, weight, family)
+    _FONTS: dict = {}
+
     def __init__(self):
         self.window: Optional[ctk.CTkToplevel] = None
         self.on_complete: Optional[Callable] = None
@@ -23,103 +33,100 @@ class SetupWizard:
         self.continue_btn: Optional[ctk.CTkButton] = None
 
     @staticmethod
-    def find_virtual_devices() -> List[dict]:
-        """Find virtual audio devices."""
+    def _scan_virtual_devices() -> List[dict]:
+        """Query output devices that look like virtual cables."""
         virtual_devices = []
-        keywords = ['cable', 'virtual', 'vb-audio', 'blackhole', 'soundflower', 'loopback']
-
         try:
-            for i, dev in enumerate(sd.query_devices()):
-                if dev['max_output_channels'] > 0:
-                    name_lower = dev['name'].lower()
-                    if any(kw in name_lower for kw in keywords):
-                        virtual_devices.append({
-                            'id': i,
-                            'name': dev['name'],
-                            'channels': dev['max_output_channels']
-                        })
+            for dev in query_devices():
+                if dev['max_output_channels'] > 0 and is_virtual_device_name(dev['name']):
+                    virtual_devices.append({
+                        'id': dev['index'],
+                        'name': dev['name'],
+                        'channels': dev['max_output_channels']
+                    })
         except Exception:
             pass
-
         return virtual_devices
 
+    @staticmethod
+    def find_virtual_devices() -> List[dict]:
+        """Find virtual audio devices (cached for a few seconds)."""
+        return _devices_cache.get(SetupWizard._scan_virtual_devices)
+
+    @staticmethod
+    def invalidate_cache():
+        """Force the next find_virtual_devices() to re-query devices."""
+        _devices_cache.invalidate()
+
     @staticmethod
     def needs_setup() -> bool:
         """Check if setup wizard should be shown."""
         return len(SetupWizard.find_virtual_devices()) == 0
 
-    def _create_step(self, parent, number: str, title: str, details: str) -> ctk.CTkFrame:
-        """Create a step frame with number, title, and details."""
-        frame = ctk.CTkFrame(parent, fg_color="transparent")
-
-        # Header row
-        header = ctk.CTkFrame(frame, fg_color="transparent")
-        header.pack(fill="x")
-
-        num_label = ctk.CTkLabel(
-            header,
-            text=number,
-            font=ctk.CTkFont(size=14, weight="bold"),
-            width=28,
-            height=28,
-            corner_radius=14,
-            fg_color="#3B8ED0"
-        )
-        num_label.pack(side="left", padx=(0, 10))
-
-        title_label = ctk.CTkLabel(
-            header,
-            text=title,
-            font=ctk.CTkFont(size=14, weight="bold"),
-            anchor="w"
-        )
-        title_label.pack(side="left", fill="x", expand=True)
-
-        # Details
-        if details:
-            details_label = ctk.CTkLabel(
-                frame,
-                text=details,
-                font=ctk.CTkFont(size=12),
-                text_color="gray",
-                anchor="w",
-                justify="left"
-            )
-            details_label.pack(fill="x", padx=(38, 0), pady=(2, 0))
-
-        return frame
+    @classmethod
+    def _font(cls, size: int, weight: str = "normal", family: Optional[str] = None) -> ctk.CTkFont:
+        """Return a shared CTkFont for the given style."""
+        key = (size, weight, family)
+        font = cls._FONTS.get(key)
+        if font is None:
+            font = cls._FONTS[key] = ctk.CTkFont(family=family, size=size, weight=weight)
+        return font
 
     def show(self, parent: ctk.CTk):
         """Show the setup wizard window."""
         self.window = ctk.CTkToplevel(parent)
+        # Kept hidden until every widget is packed, so it's drawn once
+        self.window.withdraw()
+        self.window.transient(parent)
         self.window.title("Meo Mic Setup")
-        self.window.geometry("520x720")
         self.window.resizable(False, False)
-        self.window.transient(parent)
-        self.window.grab_set()
 
-        # Center on parent
-        self.window.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() - 520) // 2
-        y = parent.winfo_y() + (parent.winfo_height() - 720) // 2
-        self.window.geometry(f"520x720+{x}+{y}")
+        # Center on parent - our size is fixed, so no layout pass is needed.
+        # An unmapped parent reports 1x1 at 0,0, so use the screen instead.
+        if parent.winfo_ismapped():
+            x = parent.winfo_rootx() + (parent.winfo_width() - 520) // 2
+            y = parent.winfo_rooty() + (parent.winfo_height() - 720) // 2
+        else:
+            x = (parent.winfo_screenwidth() - 520) // 2
+            y = (parent.winfo_screenheight() - 720) // 2
+        self.window.geometry(f"520x720+{max(0, x)}+{max(0, y)}")
 
         # Main container with scrolling
         main = ctk.CTkFrame(self.window, fg_color="transparent")
         main.pack(fill="both", expand=True, padx=25, pady=20)
 
+        scroll_frame = self._build_chrome(main)
+        self._build_details(scroll_frame)
+
+        self.window.deiconify()
+        # Grab once the window is mapped, avoiding an extra modal redraw
+        self.window.after(50, self._grab)
+
+        # Initial check
+        self._recheck()
+
+    def _grab(self):
+        """Make the wizard modal."""
+        if self.window and self.window.winfo_exists():
+            try:
+                self.window.grab_set()
+            except tk.TclError:
+                pass  # Not viewable (e.g. minimized) - stay non-modal
+
+    def _build_chrome(self, main: ctk.CTkFrame) -> ctk.CTkScrollableFrame:
+        """Build the title, status and buttons; return the empty scroll area."""
         # Title
         title = ctk.CTkLabel(
             main,
             text="Virtual Audio Setup",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=self._font(24, "bold")
         )
         title.pack(pady=(0, 3))
 
         subtitle = ctk.CTkLabel(
             main,
             text="One-time setup to use your phone as a PC microphone",
-            font=ctk.CTkFont(size=12),
+            font=self._font(12),
             text_color="gray"
         )
         subtitle.pack(pady=(0, 15))
@@ -128,6 +135,59 @@ class SetupWizard:
         scroll_frame = ctk.CTkScrollableFrame(main, fg_color="transparent", height=480)
         scroll_frame.pack(fill="both", expand=True)
 
+        # Status and buttons (outside scroll)
+        bottom_frame = ctk.CTkFrame(main, fg_color="transparent")
+        bottom_frame.pack(fill="x", pady=(10, 0))
+
+        self.status_label = ctk.CTkLabel(
+            bottom_frame,
+            text="",
+            font=self._font(12)
+        )
+        self.status_label.pack(pady=(0, 8))
+
+        btn_frame = ctk.CTkFrame(bottom_frame, fg_color="transparent")
+        btn_frame.pack(fill="x")
+
+        skip_btn = ctk.CTkButton(
+            btn_frame,
+            text="Skip for now",
+            width=110,
+            height=36,
+            corner_radius=8,
+            fg_color="#444",
+            hover_color="#555",
+            command=self._on_skip
+        )
+        skip_btn.pack(side="left")
+
+        recheck_btn = ctk.CTkButton(
+            btn_frame,
+            text="Re-check",
+            width=90,
+            height=36,
+            corner_radius=8,
+            fg_color="#444",
+            hover_color="#555",
+            command=self._on_recheck
+        )
+        recheck_btn.pack(side="left", padx=10)
+
+        self.continue_btn = ctk.CTkButton(
+            btn_frame,
+            text="Continue",
+            width=110,
+            height=36,
+            corner_radius=8,
+            state="disabled",
+            command=self._on_continue
+        )
+        self.continue_btn.pack(side="right")
+
+        return scroll_frame
+
+    def _build_details(self, scroll_frame: ctk.CTkScrollableFrame):
+        """Build the installation steps and explanation cards."""
         # Why needed card
         why_card = ctk.CTkFrame(scroll_frame, corner_radius=10)
         why_card.pack(fill="x", pady=(0, 15))
@@ -135,7 +195,7 @@ class SetupWizard:
         why_title = ctk.CTkLabel(
             why_card,
             text="Why is this needed?",
-            font=ctk.CTkFont(size=13, weight="bold")
+            font=self._font(13, "bold")
         )
         why_title.pack(pady=(12, 5), padx=15, anchor="w")
 
@@ -144,7 +204,7 @@ class SetupWizard:
             text="VB-Cable creates a virtual audio device that acts as a bridge.\n"
                  "Meo Mic sends audio to this virtual device, and apps like\n"
                  "Discord, Zoom, or games can use it as a microphone input.",
-            font=ctk.CTkFont(size=12),
+            font=self._font(12),
             text_color="gray",
             justify="left"
         )
@@ -154,17 +214,29 @@ class SetupWizard:
         steps_title = ctk.CTkLabel(
             scroll_frame,
             text="Installation Steps",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=self._font(16, "bold")
         )
         steps_title.pack(fill="x", pady=(5, 10), anchor="w")
 
-        # Step 1
-        step1 = self._create_step(
-            scroll_frame, "1",
-            "Download VB-Cable",
-            "Click the button below to open the download page"
+        # All five steps in one label - far fewer widgets to draw and scroll
+        steps_text = ctk.CTkLabel(
+            scroll_frame,
+            text="①  Download VB-Cable\n"
+                 "      Use the Download button below to open the download page\n\n"
+                 "②  Extract the ZIP file\n"
+                 "      Right-click the downloaded file → Extract All\n\n"
+                 "③  Run the correct installer\n"
+                 "      64-bit Windows (most PCs):  VBCABLE_Setup_x64.exe\n"
+                 "      32-bit Windows:  VBCABLE_Setup.exe\n\n"
+                 "④  Run as Administrator\n"
+                 "      Right-click installer → 'Run as administrator' → Install\n\n"
+                 "⑤  Restart your PC\n"
+                 "      Required for Windows to detect the new audio device",
+            font=self._font(13),
+            justify="left",
+            anchor="w"
         )
-        step1.pack(fill="x", pady=5)
+        steps_text.pack(fill="x", pady=5, anchor="w")
 
         download_btn = ctk.CTkButton(
             scroll_frame,
@@ -174,61 +246,13 @@ class SetupWizard:
             corner_radius=8,
             command=self._open_download
         )
-        download_btn.pack(pady=(5, 10))
-
-        # Step 2
-        step2 = self._create_step(
-            scroll_frame, "2",
-            "Extract the ZIP file",
-            "Right-click the downloaded file → Extract All"
-        )
-        step2.pack(fill="x", pady=5)
-
-        # Step 3 - Important!
-        step3 = self._create_step(
-            scroll_frame, "3",
-            "Run the correct installer",
-            ""
-        )
-        step3.pack(fill="x", pady=5)
-
-        # Installer info box
-        installer_card = ctk.CTkFrame(scroll_frame, corner_radius=8, fg_color="#2D3748")
-        installer_card.pack(fill="x", padx=(38, 0), pady=5)
-
-        installer_text = ctk.CTkLabel(
-            installer_card,
-            text="For 64-bit Windows (most PCs):\n"
-                 "   Run  VBCABLE_Setup_x64.exe\n\n"
-                 "For 32-bit Windows:\n"
-                 "   Run  VBCABLE_Setup.exe",
-            font=ctk.CTkFont(size=12, family="Consolas"),
-            justify="left",
-            anchor="w"
-        )
-        installer_text.pack(pady=10, padx=12, anchor="w")
-
-        # Step 4
-        step4 = self._create_step(
-            scroll_frame, "4",
-            "Run as Administrator",
-            "Right-click installer → 'Run as administrator' → Install"
-        )
-        step4.pack(fill="x", pady=5)
-
-        # Step 5
-        step5 = self._create_step(
-            scroll_frame, "5",
-            "Restart your PC",
-            "Required for Windows to detect the new audio device"
-        )
-        step5.pack(fill="x", pady=5)
+        download_btn.pack(pady=(10, 5))
 
         # After Installation
         after_title = ctk.CTkLabel(
             scroll_frame,
             text="After Installation",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=self._font(16, "bold")
         )
         after_title.pack(fill="x", pady=(15, 10), anchor="w")
 
@@ -239,7 +263,7 @@ class SetupWizard:
         how_title = ctk.CTkLabel(
             how_card,
             text="How to use Meo Mic with VB-Cable",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self._font(13, "bold"),
             text_color="#4ADE80"
         )
         how_title.pack(pady=(12, 8), padx=15, anchor="w")
@@ -251,7 +275,7 @@ class SetupWizard:
         ctk.CTkLabel(
             ezmic_frame,
             text="In Meo Mic:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self._font(12, "bold"),
             width=100,
             anchor="w"
         ).pack(side="left")
@@ -259,7 +283,7 @@ class SetupWizard:
         ctk.CTkLabel(
             ezmic_frame,
             text="Select \"CABLE Input\" as Output Device",
-            font=ctk.CTkFont(size=12),
+            font=self._font(12),
             text_color="#A0AEC0"
         ).pack(side="left")
 
@@ -270,7 +294,7 @@ class SetupWizard:
         ctk.CTkLabel(
             app_frame,
             text="In Discord/Zoom:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self._font(12, "bold"),
             width=100,
             anchor="w"
         ).pack(side="left")
@@ -278,7 +302,7 @@ class SetupWizard:
         ctk.CTkLabel(
             app_frame,
             text="Select \"CABLE Output\" as Microphone",
-            font=ctk.CTkFont(size=12),
+            font=self._font(12),
             text_color="#A0AEC0"
         ).pack(side="left")
 
@@ -286,7 +310,7 @@ class SetupWizard:
         flow_label = ctk.CTkLabel(
             how_card,
             text="Phone → Meo Mic → CABLE Input → CABLE Output → Discord",
-            font=ctk.CTkFont(size=11),
+            font=self._font(11),
             text_color="#68D391"
         )
         flow_label.pack(pady=(10, 12))
@@ -298,7 +322,7 @@ class SetupWizard:
         naming_title = ctk.CTkLabel(
             naming_card,
             text="Why are the names confusing?",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self._font(12, "bold"),
             text_color="#F6AD55"
         )
         naming_title.pack(pady=(10, 5), padx=15, anchor="w")
@@ -309,65 +333,13 @@ class SetupWizard:
                  "   (because you output/send audio TO the cable)\n\n"
                  "• CABLE Output appears in INPUT devices\n"
                  "   (because apps read/input audio FROM the cable)",
-            font=ctk.CTkFont(size=11),
+            font=self._font(11),
             text_color="#CBD5E0",
             justify="left",
             anchor="w"
         )
         naming_text.pack(pady=(0, 10), padx=15, anchor="w")
 
-        # Status and buttons (outside scroll)
-        bottom_frame = ctk.CTkFrame(main, fg_color="transparent")
-        bottom_frame.pack(fill="x", pady=(10, 0))
-
-        self.status_label = ctk.CTkLabel(
-            bottom_frame,
-            text="",
-            font=ctk.CTkFont(size=12)
-        )
-        self.status_label.pack(pady=(0, 8))
-
-        btn_frame = ctk.CTkFrame(bottom_frame, fg_color="transparent")
-        btn_frame.pack(fill="x")
-
-        skip_btn = ctk.CTkButton(
-            btn_frame,
-            text="Skip for now",
-            width=110,
-            height=36,
-            corner_radius=8,
-            fg_color="#444",
-            hover_color="#555",
-            command=self._on_skip
-        )
-        skip_btn.pack(side="left")
-
-        recheck_btn = ctk.CTkButton(
-            btn_frame,
-            text="Re-check",
-            width=90,
-            height=36,
-            corner_radius=8,
-            fg_color="#444",
-            hover_color="#555",
-            command=self._recheck
-        )
-        recheck_btn.pack(side="left", padx=10)
-
-        self.continue_btn = ctk.CTkButton(
-            btn_frame,
-            text="Continue",
-            width=110,
-            height=36,
-            corner_radius=8,
-            state="disabled",
-            command=self._on_continue
-        )
-        self.continue_btn.pack(side="right")
-
-        # Initial check
-        self._recheck()
-
     def _open_download(self):
         """Open VB-Cable download page."""
         webbrowser.open(self.VB_CABLE_URL)
@@ -376,9 +348,32 @@ class SetupWizard:
             text_color="gray"
         )
 
+    def _on_recheck(self):
+        """Handle Re-check button - always query devices fresh."""
+        self.invalidate_cache()
+        self._recheck()
+
     def _recheck(self):
-        """Re-check for virtual audio devices."""
+        """Re-check for virtual audio devices (scans on a worker thread)."""
+        self.status_label.configure(text="Scanning for audio devices...", text_color="gray")
+        self.continue_btn.configure(state="disabled")
+        threading.Thread(target=self._scan_worker, daemon=True).start()
+
+    def _scan_worker(self):
+        """Query devices off the Tk thread and hand the result back to it."""
         devices = self.find_virtual_devices()
+        window = self.window
+        if window is None:
+            return  # Wizard was closed while scanning
+        try:
+            window.after(0, partial(self._apply_scan_result, devices))
+        except (RuntimeError, tk.TclError):
+            pass  # Wizard was closed while scanning
+
+    def _apply_scan_result(self, devices: List[dict]):
+        """Show the scan result (main thread)."""
+        if not self.window or not self.window.winfo_exists():
+            return
 
         if devices:
             device_names = ", ".join(d['name'][:30] for d in devices[:2])
@@ -398,6 +393,7 @@ class SetupWizard:
         """Handle skip button."""
         if self.window:
             self.window.destroy()
+            self.window = None
         if self.on_skip:
             self.on_skip()
 
@@ -405,6 +401,7 @@ class SetupWizard:
         """Handle continue button."""
         if self.window:
             self.window.destroy()
+            self.window = None
         if self.on_complete:
             self.on_complete()
 
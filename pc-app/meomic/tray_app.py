@@ -8,20 +8,146 @@ Provides a minimal system tray icon with:
 - Quick access to settings
 """
 
+import functools
 import io
+import logging
 import os
 import sys
 import threading
 import webbrowser
-from typing import Optional, Callable
-from PIL import Image, ImageDraw
+from typing import Optional, Callable, List
+from PIL import Image, ImageChops, ImageDraw
 import pystray
 from pystray import MenuItem as Item
 
-from .audio_output import AudioOutput, get_platform_instructions
+from .audio_output import (AudioOutput, DeviceListCache, get_platform_instructions,
+                           mark_devices_changed)
+from .device_watcher import DeviceWatcher
+
+# Silent by default; run() adds a console handler when there is a console
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def _attach_console_handler():
+    """Show tray messages on the console if one exists and logging isn't set up."""
+    if sys.stderr is None or logging.getLogger().hasHandlers():
+        return  # pythonw has no console / the app configured logging itself
+    if any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+@functools.lru_cache(maxsize=1)
+def _fallback_icon() -> Image.Image:
+    """Create a fallback icon if file not found (built once per process)."""
+    size = 64
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse([4, 4, size - 4, size - 4], fill='#666666')
+    draw.rounded_rectangle([24, 14, 40, 38], radius=6, fill='white')
+    draw.arc([18, 28, 46, 48], start=0, end=180, fill='white', width=3)
+    draw.line([32, 48, 32, 54], fill='white', width=3)
+    draw.line([24, 54, 40, 54], fill='white', width=3)
+    return img
+
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    _CF_UNICODETEXT = 13
+    _GMEM_MOVEABLE = 0x0002
+
+    # Private DLL handles, so these prototypes don't touch ctypes.windll's
+    # function objects shared with the rest of the process
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    _kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    _kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    _kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalLock.restype = wintypes.LPVOID
+    _kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalUnlock.restype = wintypes.BOOL
+    _kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalFree.restype = wintypes.HGLOBAL
+    _user32.OpenClipboard.argtypes = [wintypes.HWND]
+    _user32.OpenClipboard.restype = wintypes.BOOL
+    _user32.EmptyClipboard.argtypes = []
+    _user32.EmptyClipboard.restype = wintypes.BOOL
+    _user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    _user32.SetClipboardData.restype = wintypes.HANDLE
+    _user32.CloseClipboard.argtypes = []
+    _user32.CloseClipboard.restype = wintypes.BOOL
+
+
+def _set_clipboard_windows(text: str):
+    """Put text on the Windows clipboard via user32/kernel32."""
+    data = ctypes.create_unicode_buffer(text)
+    size = ctypes.sizeof(data)
+    handle = _kernel32.GlobalAlloc(_GMEM_MOVEABLE, size)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    ptr = _kernel32.GlobalLock(handle)
+    if not ptr:
+        error = ctypes.get_last_error()
+        _kernel32.GlobalFree(handle)
+        raise ctypes.WinError(error)
+    ctypes.memmove(ptr, data, size)
+    _kernel32.GlobalUnlock(handle)
+
+    if not _user32.OpenClipboard(None):
+        error = ctypes.get_last_error()
+        _kernel32.GlobalFree(handle)
+        raise ctypes.WinError(error)
+    try:
+        _user32.EmptyClipboard()
+        if not _user32.SetClipboardData(_CF_UNICODETEXT, handle):
+            error = ctypes.get_last_error()
+            _kernel32.GlobalFree(handle)  # Ownership only passes on success
+            raise ctypes.WinError(error)
+    finally:
+        _user32.CloseClipboard()
+
+
+def _set_clipboard(text: str):
+    """Copy text to the clipboard, in-process where the platform allows."""
+    if sys.platform == 'win32':
+        _set_clipboard_windows(text)
+        return
+
+    if sys.platform == 'darwin':
+        try:
+            from AppKit import NSPasteboard, NSPasteboardTypeString
+            pasteboard = NSPasteboard.generalPasteboard()
+            pasteboard.clearContents()
+            pasteboard.setString_forType_(text, NSPasteboardTypeString)
+            return
+        except ImportError:
+            cmd = ['pbcopy']
+    else:
+        cmd = ['xclip', '-selection', 'clipboard']
+
+    # No native API available - fall back to the command line tool
+    import subprocess
+    subprocess.run(cmd, input=text.encode(), check=True)
 
 
 class TrayApp:
+    # Where to look for icon.ico, in priority order
+    _ICON_SEARCH_PATHS = (
+        os.path.join(os.path.dirname(sys.executable), 'icon.ico'),
+        os.path.join(os.path.dirname(sys.executable), '_internal', 'icon.ico'),  # PyInstaller 6.x
+        os.path.join(os.path.dirname(__file__), '..', 'icon.ico'),
+        os.path.join(os.path.dirname(__file__), 'icon.ico'),
+        'icon.ico'
+    )
+
     def __init__(self):
         self.icon: Optional[pystray.Icon] = None
         self.is_connected = False
@@ -35,58 +161,78 @@ class TrayApp:
         self.on_quit: Optional[Callable] = None
         self.on_device_change: Optional[Callable[[int], None]] = None
 
-        # Cache the loaded icon
+        # Cache the loaded icon and the per-state images handed to pystray
         self._icon_image: Optional[Image.Image] = None
+        self._icon_connected: Optional[Image.Image] = None
+        self._icon_disconnected: Optional[Image.Image] = None
         self._load_icon()
 
+        # Debounced icon updates - only the latest state is pushed
+        self._pending_state: Optional[tuple] = None  # (connected, client_ip)
+        self._update_timer: Optional[threading.Timer] = None
+        self._update_lock = threading.Lock()
+
+        # Device list for the submenu, re-queried at most every few seconds
+        self._device_cache = DeviceListCache(ttl=3.0)
+        # Submenu items, rebuilt only when devices or the selection change
+        self._device_items_key: Optional[tuple] = None
+        self._device_items: list = []
+        self._menu: Optional[pystray.Menu] = None
+
+        # Invalidates the device cache on real device changes (where supported)
+        self._device_watcher = DeviceWatcher()
+        self._device_watcher.add_callback(mark_devices_changed)
+        self._device_watcher.add_callback(self.invalidate_device_cache)
+
     def _load_icon(self):
         """Load the icon from file."""
-        icon_paths = [
-            os.path.join(os.path.dirname(sys.executable), 'icon.ico'),
-            os.path.join(os.path.dirname(sys.executable), '_internal', 'icon.ico'),  # PyInstaller 6.x
-            os.path.join(os.path.dirname(__file__), '..', 'icon.ico'),
-            os.path.join(os.path.dirname(__file__), 'icon.ico'),
-            'icon.ico'
-        ]
-
-        for icon_path in icon_paths:
-            if os.path.exists(icon_path):
-                try:
-                    self._icon_image = Image.open(icon_path)
-                    # Resize to 64x64 for tray
-                    self._icon_image = self._icon_image.resize((64, 64), Image.Resampling.LANCZOS)
-                    return
-                except Exception:
-                    pass
-
-        # Fallback: create a simple icon if file not found
-        self._icon_image = self._create_fallback_icon()
-
-    def _create_fallback_icon(self) -> Image.Image:
-        """Create a fallback icon if file not found."""
-        size = 64
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        draw.ellipse([4, 4, size - 4, size - 4], fill='#666666')
-        draw.rounded_rectangle([24, 14, 40, 38], radius=6, fill='white')
-        draw.arc([18, 28, 46, 48], start=0, end=180, fill='white', width=3)
-        draw.line([32, 48, 32, 54], fill='white', width=3)
-        draw.line([24, 54, 40, 54], fill='white', width=3)
-        return img
-
-    def create_icon_image(self, connected: bool = False) -> Image.Image:
-        """Get the tray icon image."""
-        if self._icon_image:
-            return self._icon_image.copy()
-        return self._create_fallback_icon()
+        icon_path = next((p for p in self._ICON_SEARCH_PATHS if os.path.isfile(p)), None)
+        self._icon_image = None
+        if icon_path:
+            try:
+                img = Image.open(icon_path)
+                # Scale to 64x64 for tray - in place when shrinking
+                if img.width < 64 or img.height < 64:
+                    img = img.resize((64, 64), Image.Resampling.LANCZOS)
+                else:
+                    img.thumbnail((64, 64), Image.Resampling.LANCZOS)
+                self._icon_image = img.convert('RGBA')
+            except Exception:
+                pass
+
+        if self._icon_image is None:
+            # Fallback: create a simple icon if file not found
+            self._icon_image = _fallback_icon()
+
+        # Tinted state variants, built once so state changes don't allocate
+        base = self._icon_image
+        self._icon_connected = ImageChops.multiply(
+            base, Image.new('RGBA', base.size, (120, 220, 140, 255)))
+        self._icon_disconnected = ImageChops.multiply(
+            base, Image.new('RGBA', base.size, (220, 120, 120, 255)))
 
     def update_icon(self, connected: bool, client_ip: Optional[str] = None):
         """Update the tray icon based on connection status."""
         self.is_connected = connected
         self.client_ip = client_ip
 
-        if self.icon:
-            self.icon.icon = self.create_icon_image(connected)
+        # Coalesce bursts of state changes into one update every 150ms
+        with self._update_lock:
+            self._pending_state = (connected, client_ip)
+            if self._update_timer is None:
+                self._update_timer = threading.Timer(0.15, self._flush_icon_update)
+                self._update_timer.daemon = True
+                self._update_timer.start()
+
+    def _flush_icon_update(self):
+        """Apply the latest pending connection state to the tray icon."""
+        with self._update_lock:
+            self._update_timer = None
+            state, self._pending_state = self._pending_state, None
+
+        if state and self.icon:
+            connected, client_ip = state
+            self.icon.icon = self._icon_connected if connected else self._icon_disconnected
             if connected:
                 self.icon.title = f"Meo Mic - Connected ({client_ip})"
             else:
@@ -99,46 +245,66 @@ class TrayApp:
         if self.icon and not self.is_connected:
             self.icon.title = f"Meo Mic - Waiting for connection\n{ip}:{port}"
 
-    def _create_menu(self):
-        """Create the tray menu."""
-        def get_status(item):
-            if self.is_connected:
-                return f"Connected: {self.client_ip}"
-            return f"Waiting... ({self.local_ip}:{self.port})"
+    def _get_cached_devices(self) -> List[dict]:
+        """Get output devices, reusing the last query if it's fresh."""
+        return self._device_cache.get(self.audio_output.list_devices)
 
-        def get_devices_submenu():
-            """Generate device selection submenu."""
-            items = []
-            if self.audio_output:
-                devices = self.audio_output.list_devices()
-                current = self.audio_output.output_device
+    def invalidate_device_cache(self):
+        """Force the next device submenu to re-query devices."""
+        self._device_cache.invalidate()
 
-                for dev in devices:
-                    name = dev['name']
-                    if dev['is_virtual']:
-                        name = f"* {name}"  # Mark virtual devices
+    def _status_text(self, item) -> str:
+        """Text for the status menu item."""
+        if self.is_connected:
+            return f"Connected: {self.client_ip}"
+        return f"Waiting... ({self.local_ip}:{self.port})"
 
-                    def make_handler(device_id):
-                        return lambda: self._select_device(device_id)
+    def _devices_submenu(self) -> list:
+        """Generate device selection submenu."""
+        items = []
+        if self.audio_output:
+            devices = self._get_cached_devices()
+            current_id = self.audio_output.output_device
 
-                    items.append(Item(
-                        name,
-                        make_handler(dev['id']),
-                        checked=lambda item, d=dev['id']: d == current
-                    ))
+            key = (current_id, tuple((d['id'], d['name']) for d in devices))
+            if key == self._device_items_key:
+                return self._device_items
 
-            if not items:
-                items.append(Item("No devices found", None, enabled=False))
+            for dev in devices:
+                name = dev['name']
+                if dev['is_virtual']:
+                    name = f"* {name}"  # Mark virtual devices
 
-            return items
+                def make_handler(device_id):
+                    return lambda: self._select_device(device_id)
 
+                items.append(Item(
+                    name,
+                    make_handler(dev['id']),
+                    checked=lambda _item, c=(dev['id'] == current_id): c
+                ))
+
+            self._device_items_key = key
+            self._device_items = items
+
+        if not items:
+            items.append(Item("No devices found", None, enabled=False))
+
+        return items
+
+    def _build_menu(self) -> pystray.Menu:
+        """Create the tray menu.
+
+        Built once; pystray calls the callable status text and device
+        submenu each time the menu opens, so they stay current.
+        """
         return pystray.Menu(
-            Item(get_status, None, enabled=False),
+            Item(self._status_text, None, enabled=False),
             pystray.Menu.SEPARATOR,
             Item("Show QR Code", self._show_qr_code),
             Item("Copy IP Address", self._copy_ip),
             pystray.Menu.SEPARATOR,
-            Item("Output Device", pystray.Menu(get_devices_submenu)),
+            Item("Output Device", pystray.Menu(self._devices_submenu)),
             Item("Virtual Audio Setup", self._show_setup_help),
             pystray.Menu.SEPARATOR,
             Item("Quit", self._quit),
@@ -146,6 +312,7 @@ class TrayApp:
 
     def _select_device(self, device_id: int):
         """Handle device selection."""
+        self.invalidate_device_cache()
         if self.on_device_change:
             self.on_device_change(device_id)
 
@@ -159,33 +326,23 @@ class TrayApp:
         """Copy IP address to clipboard."""
         if self.local_ip:
             try:
-                import subprocess
-                import platform
-
                 text = f"{self.local_ip}:{self.port}"
-
-                if platform.system() == 'Windows':
-                    subprocess.run(['clip'], input=text.encode(), check=True)
-                elif platform.system() == 'Darwin':
-                    subprocess.run(['pbcopy'], input=text.encode(), check=True)
-                else:
-                    subprocess.run(['xclip', '-selection', 'clipboard'],
-                                   input=text.encode(), check=True)
-                print(f"[Tray] Copied to clipboard: {text}")
+                _set_clipboard(text)
+                logger.debug("[Tray] Copied to clipboard: %s", text)
             except Exception as e:
-                print(f"[Tray] Failed to copy: {e}")
+                logger.warning("[Tray] Failed to copy: %s", e)
 
     def _show_setup_help(self):
         """Show virtual audio setup instructions."""
         instructions = get_platform_instructions()
-        print(instructions)
+        logger.debug(instructions)
 
         # Also try to open in a simple window or browser
         try:
             from .help_window import show_help_window
             show_help_window(instructions)
         except Exception:
-            print(instructions)
+            logger.warning(instructions)  # No window available - console only
 
     def _quit(self):
         """Quit the application."""
@@ -196,21 +353,30 @@ class TrayApp:
 
     def run(self):
         """Run the tray application (blocking)."""
+        _attach_console_handler()
+        if self._menu is None:
+            self._menu = self._build_menu()
         self.icon = pystray.Icon(
             "MeoMic",
-            self.create_icon_image(False),
+            self._icon_disconnected,
             "Meo Mic - Starting...",
-            menu=self._create_menu()
+            menu=self._menu
         )
         self.icon.run()
 
     def run_detached(self):
         """Run the tray application in a separate thread."""
+        self._device_watcher.start()
         thread = threading.Thread(target=self.run, daemon=True)
         thread.start()
         return thread
 
     def stop(self):
         """Stop the tray application."""
+        self._device_watcher.stop()
+        with self._update_lock:
+            if self._update_timer:
+                self._update_timer.cancel()
+                self._update_timer = None
         if self.icon:
             self.icon.stop()